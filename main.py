@@ -24,6 +24,10 @@ In the code, you can also change NUM_ROWS and NUM_COLUMNS to anything and the ga
 
 In the code, Black is represented by 1, White by -1. Empty spaces are 0.
 
+Set RENJU_RULES to True to play under Renju rules. Black may then not place a stone that makes a double-three, a
+double-four or an overline (six or more in a row), and only exactly five wins for black. The bot does not bother
+blocking spaces black is not allowed to play on.
+
 
 DISCUSSION FIXED VALUES
 GRID PADDING:
@@ -65,6 +69,13 @@ BOT_DELAY_SEC = 1
 # Grid padding was added to allow stones on the edges to be considered without causing index error.
 GRID_PADDING = 4
 
+# Set to True to play under Renju rules: black (you) may not make double-threes, double-fours or overlines,
+# and only exactly five stones win for black.
+RENJU_RULES = False
+
+# Maximum number of positions remembered by the Renju forbidden-move table before it is cleared.
+RENJU_TABLE_SIZE = 100000
+
 # Line spacing is for size of the square - spacing between the lines.
 LINE_SPACING = BOARD_HEIGHT / NUM_ROWS
 
@@ -140,6 +151,199 @@ class Grid:
         print()
 
 
+class RenjuRules:
+    """
+    Forbidden-move detection for black under Renju rules: black may not make a double-three, a double-four or an
+    overline (six or more), unless the same move also makes exactly five, which always wins.
+    Deciding whether a three is 'real' needs a recursive check that its four-making point is not forbidden itself, so
+    the answers are cached twice:
+        - per position, in a table keyed by the Zobrist hash of the board, so hypothetical sub-positions are shared.
+        - for the real board, a status per empty space that is only thrown away when a stone lands on one of the
+          spaces its answer was read from, so only the spaces around the last move get checked again.
+    """
+    # The four lines through a space: horizontal, diagonal, vertical, anti-diagonal.
+    DIRECTIONS = [(0, 1), (1, 1), (1, 0), (-1, 1)]
+
+    def __init__(self, grid):
+        self.grid = grid
+
+        # Random keys for every space and color, XOR-ed together into a hash of the whole board.
+        self.zobrist = []
+        for row in range(grid.num_rows):
+            self.zobrist.append([])
+            for col in range(grid.num_columns):
+                self.zobrist[row].append({1: random.getrandbits(64), -1: random.getrandbits(64)})
+
+        self.table = {}
+        self.forbidden = {}
+        self.watchers = {}
+        self.hash = 0
+        self.reads = set()
+
+    def reset(self):
+        """
+        Forget everything about the old board. Call it whenever the grid is reset.
+        """
+        self.table.clear()
+        self.forbidden.clear()
+        self.watchers.clear()
+        self.hash = 0
+        self.reads = set()
+
+    def record_move(self, index):
+        """
+        Must be called after a stone is placed on the grid, so the hash follows the board and the cached status of
+        spaces that depended on this one is dropped.
+        """
+        self.hash ^= self.zobrist[index[0]][index[1]][self.grid.spaces[index[0]][index[1]]]
+
+        self.forbidden.pop((index[0], index[1]), None)
+        for point in self.watchers.pop((index[0], index[1]), set()):
+            self.forbidden.pop(point, None)
+
+    def is_forbidden(self, index):
+        """
+        Return True if black may not place a stone on the given space.
+        """
+        r, c = index[0], index[1]
+        if not (0 <= r < self.grid.num_rows and 0 <= c < self.grid.num_columns) or self.grid.spaces[r][c] != 0:
+            return False
+
+        if (r, c) not in self.forbidden:
+            self.reads = set()
+            self.forbidden[(r, c)] = self.check_forbidden(r, c)
+
+            for cell in self.reads:
+                self.watchers.setdefault(cell, set()).add((r, c))
+
+        return self.forbidden[(r, c)]
+
+    def is_five(self, index, pieceNum):
+        """
+        Return True if the stone on the given space is part of a line of exactly five (not six or more).
+        """
+        for dr, dc in self.DIRECTIONS:
+            back, forward = self.span(index[0], index[1], dr, dc, pieceNum)
+            if back + forward + 1 == 5:
+                return True
+        return False
+
+    def stone_at(self, r, c):
+        # Anything off the board acts like the padding value 2. Every space read is remembered for the cache.
+        if 0 <= r < self.grid.num_rows and 0 <= c < self.grid.num_columns:
+            self.reads.add((r, c))
+            return self.grid.spaces[r][c]
+        return 2
+
+    def set_stone(self, r, c, pieceNum):
+        # Place or remove a hypothetical stone, keeping the hash in sync.
+        old = self.grid.spaces[r][c]
+        if old != 0:
+            self.hash ^= self.zobrist[r][c][old]
+        self.grid.spaces[r][c] = pieceNum
+        if pieceNum != 0:
+            self.hash ^= self.zobrist[r][c][pieceNum]
+
+    def span(self, r, c, dr, dc, pieceNum):
+        """
+        Count the stones of the same color connected to (r, c) backwards and forwards along one direction.
+        """
+        back = 0
+        while self.stone_at(r - (back + 1) * dr, c - (back + 1) * dc) == pieceNum:
+            back += 1
+
+        forward = 0
+        while self.stone_at(r + (forward + 1) * dr, c + (forward + 1) * dc) == pieceNum:
+            forward += 1
+
+        return back, forward
+
+    def five_points(self, r, c, dr, dc):
+        """
+        Return the offsets of the empty spaces along one direction that would complete exactly five black stones
+        together with the black stone on (r, c).
+        """
+        points = []
+        for k in range(-4, 5):
+            x, y = r + k * dr, c + k * dc
+            if k != 0 and self.stone_at(x, y) == 0:
+                # No hash update needed: nothing is looked up in the table while this stone is down.
+                self.grid.spaces[x][y] = 1
+                back, forward = self.span(x, y, dr, dc, 1)
+                self.grid.spaces[x][y] = 0
+
+                if back + forward + 1 == 5 and k - back <= 0 <= k + forward:
+                    points.append(k)
+        return points
+
+    def count_fours(self, r, c, dr, dc):
+        points = self.five_points(r, c, dr, dc)
+        # An open four (two ends five apart) is still one four. Two other points in one line are two fours.
+        if len(points) == 2 and points[1] - points[0] == 5:
+            return 1
+        return len(points)
+
+    def is_three(self, r, c, dr, dc):
+        """
+        A line is a real three if one more stone makes an open four there, and that stone is not forbidden itself.
+        """
+        for k in range(-3, 4):
+            x, y = r + k * dr, c + k * dc
+            if k != 0 and self.stone_at(x, y) == 0:
+                self.grid.spaces[x][y] = 1
+                points = self.five_points(r, c, dr, dc)
+                self.grid.spaces[x][y] = 0
+
+                if len(points) == 2 and points[1] - points[0] == 5 and not self.check_forbidden(x, y):
+                    return True
+        return False
+
+    def check_forbidden(self, r, c):
+        """
+        Decide whether black placing on the empty space (r, c) is forbidden in the current (possibly hypothetical)
+        position, using the position table when possible.
+        """
+        key = (self.hash, r, c)
+        if key in self.table:
+            result, reads = self.table[key]
+            self.reads |= reads
+            return result
+
+        outer_reads = self.reads
+        self.reads = {(r, c)}
+        self.set_stone(r, c, 1)
+
+        lengths = []
+        for dr, dc in self.DIRECTIONS:
+            back, forward = self.span(r, c, dr, dc, 1)
+            lengths.append(back + forward + 1)
+
+        # Exactly five wins even if the move also makes something forbidden.
+        if 5 in lengths:
+            result = False
+        elif max(lengths) > 5:
+            result = True
+        else:
+            fours = [self.count_fours(r, c, dr, dc) for dr, dc in self.DIRECTIONS]
+
+            result = sum(fours) >= 2
+            if not result:
+                threes = 0
+                for n, (dr, dc) in enumerate(self.DIRECTIONS):
+                    if fours[n] == 0 and self.is_three(r, c, dr, dc):
+                        threes += 1
+                result = threes >= 2
+
+        self.set_stone(r, c, 0)
+
+        if len(self.table) > RENJU_TABLE_SIZE:
+            self.table.clear()
+        self.table[key] = (result, frozenset(self.reads))
+
+        self.reads = outer_reads | self.reads
+        return result
+
+
 class Stone(arcade.SpriteCircle):
     def __init__(self, pieceNum, list_pos):
         super().__init__(int(STONE_SIZE // 2), arcade.color.WHITE)
@@ -182,6 +386,10 @@ class InstructionsView(arcade.View):
         arcade.draw_text('Click to Start', BOARD_WIDTH // 2, -TEXT_OFFSET + BOARD_HEIGHT / 2,
                          arcade.color.WHITE, font_size=36, anchor_x='center')
 
+        if RENJU_RULES:
+            arcade.draw_text('Renju rules: no double-three, double-four or overline for black.', BOARD_WIDTH // 2,
+                             -2 * TEXT_OFFSET + BOARD_HEIGHT / 2, arcade.color.WHITE, font_size=16, anchor_x='center')
+
     def on_mouse_press(self, x, y, button, modifiers):
         """
         Called whenever the mouse is pressed --- anywhere is fine.
@@ -242,9 +450,14 @@ class GameView(arcade.View):
         super().__init__()
         # create the 2D data structure that represents the game board
         self.board = Grid(NUM_ROWS, NUM_COLUMNS)
+        # Keeps track of spaces black may not play on under Renju rules.
+        self.rules = RenjuRules(self.board)
 
         self.stones = []
 
+        # Set when the player clicks a forbidden space, so it can be shown on screen.
+        self.forbidden_clicked = False
+
         self.timer = 0
 
         self.black_score = b_score
@@ -261,6 +474,8 @@ class GameView(arcade.View):
         Set up the beginning game state
         """
         self.board.reset()
+        self.rules.reset()
+        self.forbidden_clicked = False
         self.black_score = 0
         self.white_score = 0
         self.stones.clear()
@@ -389,6 +604,7 @@ class GameView(arcade.View):
             circle = Stone(self.turn, pos)
             self.stones.append(circle)
             self.board.spaces[index[0]][index[1]] = -1
+            self.rules.record_move(index)
 
     # def bot_make_dumb_move(self):
     #     # Random for now
@@ -413,6 +629,12 @@ class GameView(arcade.View):
         else:
             return False
 
+    def is_black_playable(self, index):
+        """
+        Under Renju rules black cannot play on a forbidden space, so the bot does not need to block it.
+        """
+        return not (RENJU_RULES and self.rules.is_forbidden(index))
+
     def bot_make_move(self):
         """
         This is a huge function that is the brain of the bot. It first starts with defensive tactics, and makes offensive
@@ -458,11 +680,11 @@ class GameView(arcade.View):
                     index1 = self.assign_next_move(check_four[i][0], check_four[i][1], check_four[i][2], 3)
                     index2 = self.assign_next_move(check_four[i][0], check_four[i][1], check_four[i][2], -1)
 
-                    if self.is_space_available(index1) and self.turn == -1:
+                    if self.is_space_available(index1) and self.is_black_playable(index1) and self.turn == -1:
                         self.bot_create_stone(index1)
                         self.turn = 1
 
-                    elif self.is_space_available(index2) and self.turn == -1:
+                    elif self.is_space_available(index2) and self.is_black_playable(index2) and self.turn == -1:
                         self.bot_create_stone(index2)
                         self.turn = 1
 
@@ -473,8 +695,9 @@ class GameView(arcade.View):
                     index1 = self.assign_next_move(check_three[i][0], check_three[i][1], check_three[i][2], 3)
                     index2 = self.assign_next_move(check_three[i][0], check_three[i][1], check_three[i][2], -1)
 
-                    # only if both ends are free, block the three
-                    if self.is_space_available(index1) and self.is_space_available(index2) and self.turn == -1:
+                    # only if both ends are free, block the three (unless black is not allowed to extend it anyway)
+                    if self.is_space_available(index1) and self.is_space_available(index2) \
+                            and self.is_black_playable(index1) and self.turn == -1:
                         self.bot_create_stone(index1)
                         self.turn = 1
 
@@ -596,6 +819,9 @@ class GameView(arcade.View):
         if self.turn == 1:
             arcade.draw_text('Your turn!', SCORE_X_OFFSET, SCORE_Y_OFFSET - 25,
                              arcade.color.RED, font_size=15, anchor_x='center')
+        if self.turn == 1 and self.forbidden_clicked:
+            arcade.draw_text('Forbidden move!', SCORE_X_OFFSET, SCORE_Y_OFFSET - 45,
+                             arcade.color.RED, font_size=15, anchor_x='center')
         if self.turn == -1:
             arcade.draw_text('Thinking...', BOARD_WIDTH - SCORE_X_OFFSET, SCORE_Y_OFFSET - 25,
                              arcade.color.RED, font_size=15, anchor_x='center')
@@ -619,10 +845,16 @@ class GameView(arcade.View):
         pos = self.check_mouse_position(x, y)
 
         if self.turn == 1:
-            if len(pos) != 0 and self.board.spaces[pos[0]][pos[1]] == 0:
+            # Under Renju rules, refuse double-threes, double-fours and overlines for black.
+            if len(pos) != 0 and RENJU_RULES and self.rules.is_forbidden(pos):
+                self.forbidden_clicked = True
+
+            elif len(pos) != 0 and self.board.spaces[pos[0]][pos[1]] == 0:
                 circle = Stone(self.turn, [self.board.centers[pos[0]][pos[1]][0], self.board.centers[pos[0]][pos[1]][1]])
                 self.stones.append(circle)
                 self.board.spaces[pos[0]][pos[1]] = self.turn
+                self.rules.record_move(pos)
+                self.forbidden_clicked = False
 
                 # Reset timer so that there's buffer to bot's move.
                 self.timer = 0
@@ -631,9 +863,13 @@ class GameView(arcade.View):
 
         # Check win for black and white
 
-        five_black = self.check_stone_connection(5, 1)
+        # Under Renju rules only exactly five wins for black, so check the last move for an exact five.
+        if RENJU_RULES:
+            black_won = len(pos) != 0 and self.board.spaces[pos[0]][pos[1]] == 1 and self.rules.is_five(pos, 1)
+        else:
+            black_won = len(self.check_stone_connection(5, 1)) > 0
 
-        if len(five_black) > 0:
+        if black_won:
             self.black_score += 1
             self.window.show_view(GameOverView(1, self.black_score, self.white_score))
 